@@ -1,16 +1,17 @@
 """Package discovery via uv workspace metadata."""
 
+import functools
+import os
 import subprocess
 import tomllib
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional
 
-import yaml
 from pydantic import BaseModel
 
 
-@dataclass
+@dataclass(slots=True)
 class Package:
     """Represents a package with its metadata."""
 
@@ -23,12 +24,29 @@ class Package:
     typechecker: str = "mypy"
     generate_typechecking_step: bool = True
     generate_alembic_migration_check_step: bool = False
-    custom_steps: Optional[list[dict]] = None
+    custom_steps: list[dict] = field(default_factory=list)
     workspace_dependencies: list["Package"] = field(default_factory=list)
 
-    def __post_init__(self):
-        if self.custom_steps is None:
-            self.custom_steps = []
+
+@functools.lru_cache(maxsize=256)
+def _parse_toml(data: bytes) -> dict:
+    return tomllib.loads(data.decode("utf-8"))
+
+
+def load_pyproject(path: Path, marker: Optional[bytes] = None) -> dict:
+    """Parse a pyproject.toml, reusing the result for identical file contents.
+
+    If `marker` is given and does not occur anywhere in the raw file, the
+    file cannot contain the section being looked for, so parsing is skipped
+    and an empty dict is returned.
+
+    The returned dict is shared between callers and must not be mutated.
+    Raises FileNotFoundError if the file does not exist.
+    """
+    data = path.read_bytes()
+    if marker is not None and marker not in data:
+        return {}
+    return _parse_toml(data)
 
 
 class UvMember(BaseModel):
@@ -55,6 +73,18 @@ class UvWorkspaceMetadata(BaseModel):
     resolution: dict[str, UvResolutionEntry] = {}
 
 
+def _relative_path(path: Path, root: Path) -> str:
+    """Return `path` relative to `root` with forward slashes ("." for the root)."""
+    path_str = str(path)
+    root_str = str(root)
+    if path_str == root_str:
+        return "."
+    prefix = root_str if root_str.endswith(os.sep) else root_str + os.sep
+    if path_str.startswith(prefix):
+        return path_str[len(prefix) :].replace(os.sep, "/")
+    return path.relative_to(root).as_posix()
+
+
 def _transitive_workspace_deps(
     member_id: str,
     resolution: dict[str, UvResolutionEntry],
@@ -101,16 +131,15 @@ def discover_packages(workspace_dir: Path, workspace_config: dict) -> list[Packa
         m.id: m.name for m in metadata.members if m.id
     }
 
+    default_template_type = workspace_config.get("default_template_type", ["package"])
+
     # First pass: discover all packages and record each member's dep names.
     all_discovered: list[tuple[UvMember, list[Package]]] = []
     for member in metadata.members:
-        rel_path = member.path.relative_to(metadata.workspace_root)
-        check_root = rel_path.parts == ()
         discovered = discover_one_package(
-            metadata.workspace_root / rel_path,
+            member.path,
             metadata.workspace_root,
-            workspace_config,
-            check_root=check_root,
+            default_template_type,
         )
         all_discovered.append((member, discovered))
 
@@ -123,11 +152,9 @@ def discover_packages(workspace_dir: Path, workspace_config: dict) -> list[Packa
     # so unconfigured dependencies appear in workspace_dependencies.
     for member in metadata.members:
         if member.name not in package_by_name:
-            rel_path = member.path.relative_to(metadata.workspace_root)
-            relative_path = "." if rel_path.parts == () else str(rel_path)
             package_by_name[member.name] = Package(
                 name=member.name,
-                path=relative_path,
+                path=_relative_path(member.path, metadata.workspace_root),
                 package_name=member.name.replace("-", "_"),
                 generate=False,
             )
@@ -152,34 +179,26 @@ def discover_packages(workspace_dir: Path, workspace_config: dict) -> list[Packa
 def discover_one_package(
     target_dir: Path,
     workspace_dir: Path,
-    workspace_config: dict,
-    check_root: bool = False,
+    default_template_type: str | list[str],
 ) -> list[Package]:
     """Read a single package's pyproject.toml and return a Package if codegen is configured."""
     packages: list[Package] = []
 
     pyproject_path = target_dir / "pyproject.toml"
-    if not pyproject_path.exists():
-        return packages
-
     try:
-        with open(pyproject_path, "rb") as f:
-            pyproject_data = tomllib.load(f)
+        pyproject_data = load_pyproject(pyproject_path, marker=b"uv-workspace-codegen")
 
-        gh_config = pyproject_data.get("tool", {}).get("uv-workspace-codegen", {})
+        tool_section = pyproject_data.get("tool") or {}
+        gh_config = tool_section.get("uv-workspace-codegen") or {}
         if not gh_config:
             return packages
 
-        workspace_default_template_type = workspace_config.get(
-            "default_template_type", ["package"]
-        )
-        config_template_type = gh_config.get(
-            "template_type", workspace_default_template_type
-        )
+        config_template_type = gh_config.get("template_type", default_template_type)
+        # Copy: the parsed pyproject data is cached and shared between callers
         config_template_type = (
             [config_template_type]
             if not isinstance(config_template_type, list)
-            else config_template_type
+            else list(config_template_type)
         )
 
         project_name = pyproject_data.get("project", {}).get("name", target_dir.name)
@@ -188,22 +207,22 @@ def discover_one_package(
         custom_steps: list[dict] = []
         custom_steps_str = gh_config.get("custom_steps", "")
         if custom_steps_str:
+            # PyYAML is only imported when a package actually has custom steps
+            import yaml
+
+            # libyaml-backed loader when PyYAML was built with it
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
             try:
-                custom_steps = yaml.safe_load(custom_steps_str) or []
+                custom_steps = yaml.load(custom_steps_str, Loader=loader) or []
             except yaml.YAMLError as e:
                 print(
                     f"Warning: Failed to parse custom_steps YAML in {pyproject_path}: {e}"
                 )
                 custom_steps = []
 
-        if check_root:
-            relative_path = "."
-        else:
-            relative_path = str(target_dir.relative_to(workspace_dir))
-
         package = Package(
             name=project_name,
-            path=relative_path,
+            path=_relative_path(target_dir, workspace_dir),
             package_name=package_name,
             generate=gh_config.get("generate", False),
             template_type=config_template_type,
@@ -220,6 +239,9 @@ def discover_one_package(
 
         packages.append(package)
 
+    except FileNotFoundError:
+        # Members without a pyproject.toml have nothing to configure.
+        pass
     except (tomllib.TOMLDecodeError, KeyError) as e:
         print(f"Warning: Failed to parse {pyproject_path}: {e}")
 
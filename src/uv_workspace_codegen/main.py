@@ -5,7 +5,10 @@ This module contains the main function and logic for generating GitHub Actions
 workflows for libraries in the workspace.
 """
 
+import copy
 import difflib
+import functools
+import os
 import sys
 import tomllib
 from pathlib import Path
@@ -13,23 +16,34 @@ import traceback
 from typing import Optional
 
 import click
-from jinja2 import Environment, Template
+from jinja2 import Environment, FileSystemLoader, Template, TemplateNotFound
 
-from uv_workspace_codegen.discover import Package, discover_packages
+from uv_workspace_codegen.discover import Package, discover_packages, load_pyproject
+
+# Autogenerated comment prepended to every generated workflow
+_AUTOGEN_COMMENT = (
+    "# This file was automatically generated by uv-workspace-codegen\n"
+    "# For more information, see: https://github.com/epoch8/uv-workspace-codegen/blob/master/README.md\n"
+    "# Do not edit this file manually - changes will be overwritten\n\n"
+)
+_AUTOGEN_COMMENT_BYTES = _AUTOGEN_COMMENT.encode("utf-8")
+
+# First line of the comment; its presence marks a file as ours during cleanup
+_HEADER_SENTINEL = _AUTOGEN_COMMENT_BYTES.split(b"\n", 1)[0]
 
 
 def get_workspace_config(workspace_dir: Path) -> dict:
     """Get workspace-level uv-workspace-codegen configuration."""
-    pyproject_path = workspace_dir / "pyproject.toml"
-    if not pyproject_path.exists():
-        return {}
-
     try:
-        with open(pyproject_path, "rb") as f:
-            pyproject_data = tomllib.load(f)
+        pyproject_data = load_pyproject(
+            workspace_dir / "pyproject.toml", marker=b"uv-workspace-codegen"
+        )
 
-        return pyproject_data.get("tool", {}).get("uv-workspace-codegen", {})
-    except (tomllib.TOMLDecodeError, KeyError):
+        # Deep copy: the parsed pyproject data is cached and shared
+        return copy.deepcopy(
+            pyproject_data.get("tool", {}).get("uv-workspace-codegen", {})
+        )
+    except (FileNotFoundError, tomllib.TOMLDecodeError, KeyError):
         return {}
 
 
@@ -45,49 +59,69 @@ def load_template(
         "template_dir", ".github/workflow-templates"
     )
     templates_dir = workspace_dir / template_dir_str
-    template_path = templates_dir / f"{template_type}.template.yml"
+    template_name = f"{template_type}.template.yml"
+    template_path = templates_dir / template_name
+    env = _template_environment(str(templates_dir))
+
+    try:
+        return env.get_template(template_name)
+    except TemplateNotFound:
+        pass
 
     # If the requested template does not exist, and the requested type is
     # 'package', attempt to populate it from the bundled template located in
     # this package's `templates/` directory. Only create the workspace
     # templates directory when we actually need to write the default file.
-    if not template_path.exists():
-        if template_type == "package":
-            bundled_template = (
-                Path(__file__).parent / "templates" / "package.template.yml"
+    if template_type == "package":
+        try:
+            bundled_content = _bundled_package_template()
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Bundled default template missing: {_BUNDLED_PACKAGE_TEMPLATE}"
             )
-            if bundled_template.exists():
-                try:
-                    # In diff mode, we don't want to create the template file
-                    if diff_mode:
-                        with open(bundled_template, "r") as src:
-                            return create_jinja_environment().from_string(src.read())
-
-                    # Create templates dir now that we will populate it
-                    templates_dir.mkdir(parents=True, exist_ok=True)
-                    with (
-                        open(bundled_template, "r") as src,
-                        open(template_path, "w") as dst,
-                    ):
-                        dst.write(src.read())
-                except Exception:
-                    # On any failure, raise a clear FileNotFoundError to match
-                    # previous behavior for missing templates.
-                    raise FileNotFoundError(
-                        f"Template not found or could not be created: {template_path}"
-                    )
-            else:
-                raise FileNotFoundError(
-                    f"Bundled default template missing: {bundled_template}"
-                )
-        else:
-            raise FileNotFoundError(f"Template not found: {template_path}")
+        try:
+            # In diff mode, we don't want to create the template file
+            if diff_mode:
+                return env.from_string(bundled_content)
+
+            # Create templates dir now that we will populate it
+            templates_dir.mkdir(parents=True, exist_ok=True)
+            with open(template_path, "w") as dst:
+                dst.write(bundled_content)
+        except Exception:
+            # On any failure, raise a clear FileNotFoundError to match
+            # previous behavior for missing templates.
+            raise FileNotFoundError(
+                f"Template not found or could not be created: {template_path}"
+            )
+    else:
+        raise FileNotFoundError(f"Template not found: {template_path}")
+
+    return env.get_template(template_name)
+
+
+_BUNDLED_PACKAGE_TEMPLATE = Path(__file__).parent / "templates" / "package.template.yml"
 
-    with open(template_path, "r") as f:
-        template_content = f.read()
 
-    env = create_jinja_environment()
-    return env.from_string(template_content)
+@functools.lru_cache(maxsize=1)
+def _bundled_package_template() -> str:
+    """Return the bundled default 'package' template, read once per process."""
+    with open(_BUNDLED_PACKAGE_TEMPLATE, "r") as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=8)
+def _template_environment(templates_dir: str) -> Environment:
+    """Return the shared Jinja2 environment with a loader for `templates_dir`.
+
+    The loader's template cache keeps compiled templates and only recompiles
+    one when its file changes on disk. Only the most recently used template
+    directories keep an environment, so long-lived callers do not accumulate
+    one per workspace.
+    """
+    return create_jinja_environment().overlay(
+        loader=FileSystemLoader(templates_dir), cache_size=-1
+    )
 
 
 def generate_workflow(
@@ -99,37 +133,32 @@ def generate_workflow(
 ) -> Optional[Path]:
     """Generate a workflow file for a single package."""
 
-    workflow_content = template.render(
+    rendered = template.render(
         template_type=template_type,
         package=package,
     )
 
-    # Add autogenerated comment at the top
-    autogen_comment = (
-        "# This file was automatically generated by uv-workspace-codegen\n"
-        "# For more information, see: https://github.com/epoch8/uv-workspace-codegen/blob/master/README.md\n"
-        "# Do not edit this file manually - changes will be overwritten\n\n"
-    )
-
-    workflow_content = autogen_comment + workflow_content
-
     # Create workflow filename based on package name and template type
     workflow_filename = f"{template_type}-{package.name}.yml"
     workflow_path = output_dir / workflow_filename
 
     if diff_mode:
-        if workflow_path.exists():
+        # Add autogenerated comment at the top
+        workflow_content = _AUTOGEN_COMMENT + rendered
+        try:
             with open(workflow_path, "r") as f:
-                existing_content = f.readlines()
-        else:
-            existing_content = []
+                existing_content = f.read()
+        except FileNotFoundError:
+            existing_content = ""
 
-        new_content_lines = workflow_content.splitlines(keepends=True)
+        # Identical files (the usual case in CI checks) need no diff at all
+        if existing_content == workflow_content:
+            return workflow_path
 
         diff = list(
             difflib.unified_diff(
-                existing_content,
-                new_content_lines,
+                existing_content.splitlines(keepends=True),
+                workflow_content.splitlines(keepends=True),
                 fromfile=str(workflow_path),
                 tofile=str(workflow_path),
             )
@@ -139,15 +168,48 @@ def generate_workflow(
             click.echo("".join(diff), nl=False)
         return workflow_path
     else:
-        with open(workflow_path, "w") as f:
-            f.write(workflow_content)
+        new_bytes = _AUTOGEN_COMMENT_BYTES + rendered.encode("utf-8")
+        # Leave identical files untouched so their mtime does not change.
+        # A size mismatch proves a change without reading the old file.
+        try:
+            unchanged = (
+                workflow_path.stat().st_size == len(new_bytes)
+                and workflow_path.read_bytes() == new_bytes
+            )
+        except FileNotFoundError:
+            unchanged = False
+
+        if unchanged:
+            print(f"Unchanged workflow: {workflow_path}")
+            return workflow_path
+
+        _write_bytes(workflow_path, new_bytes)
 
         print(f"Generated workflow: {workflow_path}")
         return workflow_path
 
 
+def _write_bytes(path: Path, data: bytes) -> None:
+    """Write data to path without Python's buffered file layer.
+
+    Workflow files are small, so this is normally a single write() call.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=1)
 def create_jinja_environment() -> Environment:
-    """Create a Jinja2 environment with ansible filters including to_nice_yaml."""
+    """Create a Jinja2 environment with ansible filters including to_nice_yaml.
+
+    The environment is created once per process and shared by all templates.
+    """
     from jinja2_ansible_filters import AnsibleCoreFiltersExtension
 
     env = Environment(extensions=[AnsibleCoreFiltersExtension])
@@ -156,20 +218,17 @@ def create_jinja_environment() -> Environment:
 
 def is_workspace_root(path: Path) -> bool:
     """Check if a directory is a workspace root."""
-    pyproject_path = path / "pyproject.toml"
-    if not pyproject_path.exists():
-        return False
-
     try:
-        with open(pyproject_path, "rb") as f:
-            pyproject_data = tomllib.load(f)
+        # Any spelling of tool.uv.workspace contains this word, so files
+        # without it are rejected without being parsed
+        pyproject_data = load_pyproject(path / "pyproject.toml", marker=b"workspace")
 
         return (
             "tool" in pyproject_data
             and "uv" in pyproject_data["tool"]
             and "workspace" in pyproject_data["tool"]["uv"]
         )
-    except tomllib.TOMLDecodeError:
+    except (FileNotFoundError, tomllib.TOMLDecodeError):
         return False
 
 
@@ -230,30 +289,39 @@ def main(root_dir: Optional[Path], diff: bool):
             f"  - {pkg.name} (templates: {template_types_str}, package: {pkg.package_name}, tests: {pkg.generate_standard_pytest_step})"
         )
 
-    # Group packages by template type for efficient template loading
+    # Group packages by template type for efficient template loading: each
+    # template is rendered in one contiguous run. sorted() is stable, so
+    # packages keep their discovery order within a template type.
+    jobs = sorted(
+        (
+            (template_type, package)
+            for package in packages
+            for template_type in package.template_type
+        ),
+        key=lambda job: job[0],
+    )
     templates_cache = {}
     generated_files: list[Path] = []
 
-    for package in packages:
+    for template_type, package in jobs:
         try:
-            for template_type in package.template_type:
-                # Load template if not cached
-                if template_type not in templates_cache:
-                    templates_cache[template_type] = load_template(
-                        template_type,
-                        workspace_dir,
-                        workspace_config,
-                        diff_mode=diff,
-                    )
-
-                template = templates_cache[template_type]
-                generated_file = generate_workflow(
-                    package, template_type, template, workflows_dir, diff_mode=diff
+            # Load template if not cached
+            if template_type not in templates_cache:
+                templates_cache[template_type] = load_template(
+                    template_type,
+                    workspace_dir,
+                    workspace_config,
+                    diff_mode=diff,
                 )
-                if (
-                    generated_file
-                ):  # Only append if a file was actually generated (not in diff mode)
-                    generated_files.append(generated_file)
+
+            template = templates_cache[template_type]
+            generated_file = generate_workflow(
+                package, template_type, template, workflows_dir, diff_mode=diff
+            )
+            if (
+                generated_file
+            ):  # Only append if a file was actually generated (not in diff mode)
+                generated_files.append(generated_file)
         except Exception as e:
             print(f"Error generating workflow for {package.name}: {e}")
             print(traceback.format_exc())
@@ -277,37 +345,45 @@ def cleanup_stale_workflows(
     2. It has a .yml or .yaml extension
     3. It contains the autogenerated header
     4. It is NOT in the list of currently generated files
+
+    Generated files are always written to `output_dir`, so they are matched
+    by file name rather than by resolved path.
     """
-    # Normalize generated files to absolute paths for comparison
-    generated_paths = {f.resolve() for f in generated_files}
+    generated_names = {f.name for f in generated_files}
 
-    # Check all yaml files in the output directory
-    for file_path in output_dir.glob("*.yml"):
-        _check_and_delete_stale_file(file_path, generated_paths, diff_mode)
+    # Check all yaml files in the output directory in a single listing pass,
+    # skipping the ones that were just generated
+    try:
+        with os.scandir(output_dir) as entries:
+            candidates = [
+                entry.path
+                for entry in entries
+                if entry.name.endswith((".yml", ".yaml"))
+                and entry.name not in generated_names
+                and entry.is_file(follow_symlinks=False)
+            ]
+    except FileNotFoundError:
+        # Nothing to clean up (e.g. diff mode before the first generation)
+        return
 
-    for file_path in output_dir.glob("*.yaml"):
-        _check_and_delete_stale_file(file_path, generated_paths, diff_mode)
+    for file_path in candidates:
+        _check_and_delete_stale_file(file_path, diff_mode)
 
 
-def _check_and_delete_stale_file(
-    file_path: Path, generated_paths: set[Path], diff_mode: bool = False
-) -> None:
+def _check_and_delete_stale_file(file_path: str, diff_mode: bool = False) -> None:
     """Helper to check if a single file is stale and delete it if so."""
-    # Skip if this file was just generated
-    if file_path.resolve() in generated_paths:
-        return
-
     try:
-        # Check for autogenerated header
-        with open(file_path, "r") as f:
-            content = f.read(500)  # Read first 500 chars should be enough for header
+        # Check for autogenerated header; it is on the first line, so the
+        # first 200 raw bytes are enough and no decoding is needed
+        with open(file_path, "rb") as f:
+            head = f.read(200)
 
-        if "# This file was automatically generated by uv-workspace-codegen" in content:
+        if _HEADER_SENTINEL in head:
             if diff_mode:
                 print(f"Would remove stale workflow: {file_path}")
             else:
                 print(f"Removing stale workflow: {file_path}")
-                file_path.unlink()
+                os.unlink(file_path)
     except Exception as e:
         print(
             f"Warning: Failed to check/remove potentially stale file {file_path}: {e}"
@@ -41,5 +41,45 @@ def test_cleanup_logic():
     # Cleanup test directory
     shutil.rmtree(test_dir)
 
+
+HEADER = "# This file was automatically generated by uv-workspace-codegen\n"
+
+
+def test_cleanup_removes_stale_yaml_extension(tmp_path):
+    stale_file = tmp_path / "stale.yaml"
+    stale_file.write_text(HEADER + "name: Stale Workflow\n")
+    valid_file = tmp_path / "valid.yaml"
+    valid_file.write_text(HEADER + "name: Valid Workflow\n")
+
+    cleanup_stale_workflows(tmp_path, [valid_file])
+
+    assert not stale_file.exists()
+    assert valid_file.exists()
+
+
+def test_cleanup_keeps_symlinked_workflow(tmp_path):
+    target = tmp_path / "shared" / "workflow.yml"
+    target.parent.mkdir()
+    target.write_text(HEADER + "name: Shared Workflow\n")
+
+    workflows_dir = tmp_path / "workflows"
+    workflows_dir.mkdir()
+    link = workflows_dir / "linked.yml"
+    link.symlink_to(target)
+
+    cleanup_stale_workflows(workflows_dir, [])
+
+    assert link.is_symlink()
+    assert target.exists()
+
+
+def test_cleanup_missing_output_dir(tmp_path):
+    missing_dir = tmp_path / "does-not-exist"
+
+    cleanup_stale_workflows(missing_dir, [])
+
+    assert not missing_dir.exists()
+
+
 if __name__ == "__main__":
     test_cleanup_logic()
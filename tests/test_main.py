@@ -2,7 +2,9 @@
 
 import os
 import tempfile
-from pathlib import Path
+from pathlib import Path, PureWindowsPath
+
+from uv_workspace_codegen import discover
 
 from uv_workspace_codegen.main import (
     Package,
@@ -217,6 +219,45 @@ template_dir = "custom-templates"
         assert config == {"template_dir": "custom-templates"}
 
 
+def test_discovered_packages_do_not_share_cached_config():
+    """Mutating a discovered package must not leak into other packages or config."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        workspace_dir = Path(temp_dir)
+        with open(workspace_dir / "pyproject.toml", "w") as f:
+            f.write("""
+[tool.uv.workspace]
+members = ["libs/*"]
+
+[tool.uv-workspace-codegen]
+default_template_type = ["lib"]
+""")
+
+        for name in ("lib-a", "lib-b"):
+            lib_dir = workspace_dir / "libs" / name
+            lib_dir.mkdir(parents=True)
+            with open(lib_dir / "pyproject.toml", "w") as f:
+                f.write(f"""
+[project]
+name = "{name}"
+version = "0.1.0"
+
+[tool.uv-workspace-codegen]
+generate = true
+""")
+
+        config = get_workspace_config(workspace_dir)
+        packages = discover_packages(workspace_dir, config)
+        assert [p.template_type for p in packages] == [["lib"], ["lib"]]
+
+        packages[0].template_type.append("deploy")
+        config["default_template_type"].append("other")
+
+        assert packages[1].template_type == ["lib"]
+        assert get_workspace_config(workspace_dir) == {"default_template_type": ["lib"]}
+        fresh = discover_packages(workspace_dir, get_workspace_config(workspace_dir))
+        assert [p.template_type for p in fresh] == [["lib"], ["lib"]]
+
+
 def test_load_template_configurable_dir():
     """Test loading templates from configurable directory."""
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -254,6 +295,31 @@ jobs:
             assert expected_path in str(e)
 
 
+def test_load_template_reuses_compiled_template():
+    """Test that an unchanged template file is compiled only once."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        workspace_dir = Path(temp_dir)
+        templates_dir = workspace_dir / ".github" / "workflow-templates"
+        templates_dir.mkdir(parents=True)
+
+        template_path = templates_dir / "lib.template.yml"
+        with open(template_path, "w") as f:
+            f.write("name: {{ package.name }}\n")
+
+        first = load_template("lib", workspace_dir, {})
+        second = load_template("lib", workspace_dir, {})
+        assert first is second
+
+        old_mtime = template_path.stat().st_mtime
+        with open(template_path, "w") as f:
+            f.write("name: Changed {{ package.name }}\n")
+        os.utime(template_path, (old_mtime + 1, old_mtime + 1))
+
+        third = load_template("lib", workspace_dir, {})
+        assert third is not first
+        assert "Changed" in third.render(package={"name": "x"})
+
+
 def test_default_template_type():
     """Test that default template type is used when template_type is not specified."""
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -305,6 +371,37 @@ generate_standard_pytest_step = true
         assert packages[0].template_type == ["explicit-type"]
 
 
+def test_discover_packages_parses_custom_steps():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        workspace_dir = Path(temp_dir)
+        package_dir = workspace_dir / "my-package"
+        package_dir.mkdir()
+
+        with open(workspace_dir / "pyproject.toml", "w") as f:
+            f.write("""
+[tool.uv.workspace]
+members = ["my-package"]
+""")
+
+        with open(package_dir / "pyproject.toml", "w") as f:
+            f.write('''
+[project]
+name = "my-package"
+version = "0.1.0"
+
+[tool.uv-workspace-codegen]
+generate = true
+custom_steps = """
+- name: Say hello
+  run: echo hello
+"""
+''')
+
+        packages = discover_packages(workspace_dir, {})
+        assert len(packages) == 1
+        assert packages[0].custom_steps == [{"name": "Say hello", "run": "echo hello"}]
+
+
 def test_discover_packages_with_list_template_type():
     with tempfile.TemporaryDirectory() as temp_dir:
         workspace_dir = Path(temp_dir)
@@ -622,3 +719,80 @@ on: [push]
         assert "lib-my-pkg" in content
         assert "type_is: lib" in content
         assert "['lib', 'deploy']" not in content
+
+
+def test_generate_workflow_skips_unchanged_file():
+    """Test that regenerating identical content does not rewrite the file."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        workspace_dir = Path(temp_dir)
+        output_dir = workspace_dir / ".github" / "workflows"
+        output_dir.mkdir(parents=True)
+
+        template_dir = workspace_dir / "templates"
+        template_dir.mkdir()
+        with open(template_dir / "lib.template.yml", "w") as f:
+            f.write("name: {{ package.name }}\n")
+
+        template = load_template("lib", workspace_dir, {"template_dir": "templates"})
+        package = Package(name="my-pkg", path="libs/my-pkg", package_name="my_pkg")
+
+        result = generate_workflow(package, "lib", template, output_dir)
+        assert result is not None
+        os.utime(result, ns=(0, 0))
+
+        assert generate_workflow(package, "lib", template, output_dir) == result
+        assert result.stat().st_mtime_ns == 0
+
+        result.write_text("name: stale\n")
+        os.utime(result, ns=(0, 0))
+
+        generate_workflow(package, "lib", template, output_dir)
+        assert result.stat().st_mtime_ns != 0
+        assert "name: my-pkg" in result.read_text()
+
+
+def test_package_path_uses_forward_slashes():
+    """Test that package.path is "." for the root and "/"-separated otherwise."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        workspace_dir = Path(temp_dir)
+        with open(workspace_dir / "pyproject.toml", "w") as f:
+            f.write("""
+[project]
+name = "root-pkg"
+version = "0.1.0"
+
+[tool.uv.workspace]
+members = ["libs/nested/*"]
+
+[tool.uv-workspace-codegen]
+generate = true
+""")
+
+        lib_dir = workspace_dir / "libs" / "nested" / "my-lib"
+        lib_dir.mkdir(parents=True)
+        with open(lib_dir / "pyproject.toml", "w") as f:
+            f.write("""
+[project]
+name = "my-lib"
+version = "0.1.0"
+
+[tool.uv-workspace-codegen]
+generate = true
+""")
+
+        packages = discover_packages(workspace_dir, {})
+        assert {p.name: p.path for p in packages} == {
+            "root-pkg": ".",
+            "my-lib": "libs/nested/my-lib",
+        }
+
+
+def test_relative_path_normalizes_windows_separators(monkeypatch):
+    monkeypatch.setattr(discover.os, "sep", "\\")
+    root = PureWindowsPath("C:\\ws")
+
+    assert discover._relative_path(root, root) == "."
+    assert (
+        discover._relative_path(PureWindowsPath("C:\\ws\\libs\\my-lib"), root)
+        == "libs/my-lib"
+    )
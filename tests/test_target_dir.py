@@ -109,3 +109,47 @@ name = "not-workspace"
         f"Error: The provided directory '{not_workspace}' is not a valid workspace root."
         in result.output
     )
+
+
+def test_generation_error_stops_and_returns_1(tmp_path):
+    """A failing render reports the package and skips the remaining jobs."""
+    workspace_dir = tmp_path / "my_workspace"
+    workspace_dir.mkdir()
+
+    (workspace_dir / "pyproject.toml").write_text(
+        """
+[tool.uv.workspace]
+members = ["packages/*"]
+"""
+    )
+
+    templates_dir = workspace_dir / ".github" / "workflow-templates"
+    templates_dir.mkdir(parents=True)
+    (templates_dir / "broken.template.yml").write_text("{{ package.nope() }}\n")
+    (templates_dir / "working.template.yml").write_text("name: {{ package.name }}\n")
+
+    for name, template_type in (("pkg-a", "working"), ("pkg-b", "broken")):
+        pkg_dir = workspace_dir / "packages" / name
+        pkg_dir.mkdir(parents=True)
+        (pkg_dir / "pyproject.toml").write_text(
+            f"""
+[project]
+name = "{name}"
+version = "0.1.0"
+
+[tool.uv-workspace-codegen]
+generate = true
+template_type = "{template_type}"
+"""
+        )
+
+    runner = CliRunner()
+    result = runner.invoke(main, [str(workspace_dir)], standalone_mode=False)
+
+    assert result.return_value == 1
+    assert "Error generating workflow for pkg-b" in result.output
+
+    workflow_dir = workspace_dir / ".github" / "workflows"
+    # "broken" sorts before "working", so pkg-a's job never ran
+    assert not (workflow_dir / "working-pkg-a.yml").exists()
+    assert not (workflow_dir / "broken-pkg-b.yml").exists()